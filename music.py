@@ -1,19 +1,42 @@
 import os
+import re
+import atexit
 import subprocess
 import json
 import shutil
 import sys
 import hashlib
 import sqlite3
+import queue
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, List, Dict, Any, Tuple
 
 from rich.console import Console
-from rich.table import Table
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 console = Console()
+PLAYED_FMT = "%b %d  %H:%M"
+YT_URL_RE  = re.compile(
+    r"^(?:https?://)?(?:www\.|m\.|music\.)?"
+    r"(?:youtube\.com/(?:watch\?(?:.*&)?v=|shorts/)|youtu\.be/)([\w-]{11})(?![\w-])"
+)
+
+_json_loads = None
+
+def json_loads(raw):
+    """Decode yt-dlp's -J output with orjson when it's installed (much faster)."""
+    global _json_loads
+    if _json_loads is None:
+        # Imported on first use: screens that never search shouldn't pay for it
+        try:
+            from orjson import loads as _json_loads
+        except ImportError:
+            _json_loads = json.JSONDecoder().decode
+    return _json_loads(raw)
 
 def default_music_dir() -> Path:
     if os.name == "nt":
@@ -27,6 +50,8 @@ def default_music_dir() -> Path:
     return music
 
 class Config:
+    __slots__ = ("_data",)
+
     PATH = SCRIPT_DIR / "config.json"
     DEFAULTS = {
         "audio_format":   "mp3",
@@ -36,22 +61,28 @@ class Config:
         "auto_download":  False,
         "search_timeout": 20,
     }
+    # Built once rather than per json.dumps(indent=...) call
+    _encode = staticmethod(json.JSONEncoder(indent=2).encode)
+    _decode = staticmethod(json.JSONDecoder().decode)
 
     def __init__(self):
         self._data = self._load()
 
     def _load(self) -> Dict[str, Any]:
-        base = {**self.DEFAULTS, "download_dir": str(default_music_dir())}
-        if self.PATH.exists():
-            try:
-                saved = json.loads(self.PATH.read_text(encoding="utf-8"))
-                base.update(saved)
-            except json.JSONDecodeError:
-                console.print("  ⚠  Config corrupted — using defaults\n", style="yellow")
+        base = {**self.DEFAULTS}
+        try:
+            base.update(self._decode(self.PATH.read_text(encoding="utf-8")))
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError:
+            console.print("  ⚠  Config corrupted — using defaults\n", style="yellow")
+        # Only probe/create the platform music dir when the user hasn't set one
+        if "download_dir" not in base:
+            base["download_dir"] = str(default_music_dir())
         return base
 
     def save(self):
-        self.PATH.write_text(json.dumps(self._data, indent=2), encoding="utf-8")
+        self.PATH.write_text(self._encode(self._data), encoding="utf-8")
 
     def get(self, key: str, default: Any = None) -> Any:
         return self._data.get(key, default)
@@ -64,98 +95,291 @@ class Config:
 # ─── Database ─────────────────────────────────────────────────────────────────
 
 class DB:
+    __slots__ = ("path", "_conn", "_fts", "_writes", "_writer")
+
+    # Each entry upgrades the schema by one version. The applied version is
+    # kept in PRAGMA user_version so an up-to-date database skips all DDL.
+    MIGRATIONS = [
+        '''
+        CREATE TABLE IF NOT EXISTS songs (
+            id          INTEGER PRIMARY KEY AUTOINCREMENT,
+            url         TEXT UNIQUE NOT NULL,
+            url_hash    TEXT UNIQUE NOT NULL,
+            title       TEXT NOT NULL,
+            uploader    TEXT,
+            duration    INTEGER,
+            local_path  TEXT,
+            downloaded  INTEGER DEFAULT 0,
+            played_at   TEXT,
+            last_played TEXT,
+            play_count  INTEGER DEFAULT 1
+        );
+        ''',
+        # Trigram index so substring search doesn't scan every title
+        '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS songs_fts USING fts5(
+            title, content='songs', content_rowid='id', tokenize='trigram'
+        );
+        CREATE TRIGGER IF NOT EXISTS songs_fts_ai AFTER INSERT ON songs BEGIN
+            INSERT INTO songs_fts(rowid, title) VALUES (new.id, new.title);
+        END;
+        CREATE TRIGGER IF NOT EXISTS songs_fts_ad AFTER DELETE ON songs BEGIN
+            INSERT INTO songs_fts(songs_fts, rowid, title) VALUES ('delete', old.id, old.title);
+        END;
+        CREATE TRIGGER IF NOT EXISTS songs_fts_au AFTER UPDATE OF title ON songs BEGIN
+            INSERT INTO songs_fts(songs_fts, rowid, title) VALUES ('delete', old.id, old.title);
+            INSERT INTO songs_fts(rowid, title) VALUES (new.id, new.title);
+        END;
+        INSERT INTO songs_fts(songs_fts) VALUES ('rebuild');
+        ''',
+        # Lets history() walk the newest rows instead of sorting the table
+        '''
+        CREATE INDEX IF NOT EXISTS idx_songs_last_played ON songs(last_played);
+        ''',
+    ]
+
+    # Single upsert, kept as one literal so sqlite3's statement cache reuses it
+    RECORD_PLAY_SQL = '''
+        INSERT INTO songs
+            (url, url_hash, title, uploader, duration, local_path,
+             downloaded, played_at, last_played)
+        VALUES (?,?,?,?,?,?,?,?,?)
+        ON CONFLICT(url_hash) DO UPDATE SET
+            last_played = excluded.last_played,
+            play_count  = play_count + 1
+    '''
+
     def __init__(self):
         self.path = SCRIPT_DIR / "music.db"
-        with sqlite3.connect(self.path) as c:
-            c.executescript('''
-                CREATE TABLE IF NOT EXISTS songs (
-                    id          INTEGER PRIMARY KEY AUTOINCREMENT,
-                    url         TEXT UNIQUE NOT NULL,
-                    url_hash    TEXT UNIQUE NOT NULL,
-                    title       TEXT NOT NULL,
-                    uploader    TEXT,
-                    duration    INTEGER,
-                    local_path  TEXT,
-                    downloaded  INTEGER DEFAULT 0,
-                    played_at   TEXT,
-                    last_played TEXT,
-                    play_count  INTEGER DEFAULT 1
-                );
-            ''')
-
-    def _conn(self):
-        conn = sqlite3.connect(self.path)
+        # One connection for the whole session instead of one per query
+        self._conn = self._connect()
+
+        version = self._conn.execute('PRAGMA user_version').fetchone()[0]
+        for v, script in enumerate(self.MIGRATIONS[version:], version + 1):
+            try:
+                self._conn.executescript(script)
+            except sqlite3.OperationalError as e:
+                # Some SQLite builds ship without FTS5 or the trigram tokenizer;
+                # search_local falls back to a plain LIKE scan there
+                if "fts5" not in str(e) and "tokenizer" not in str(e):
+                    raise
+            self._conn.execute(f'PRAGMA user_version = {v}')
+        self._fts = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name='songs_fts'"
+        ).fetchone() is not None
+
+        # Play records are written by a background thread so starting
+        # playback never waits on the database
+        self._writes  = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
         conn.row_factory = sqlite3.Row
+        conn.executescript('''
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA cache_size=-8000;
+            PRAGMA temp_store=MEMORY;
+        ''')
         return conn
 
-    def record_play(self, url, title, uploader, duration, local_path=None):
+    def _save(self, conn, items):
+        """Write queued row lists in one transaction. If that fails, each list
+        is retried on its own so one bad play doesn't drop the rest."""
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.executemany(self.RECORD_PLAY_SQL, [r for item in items for r in item])
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+        except Exception as e:
+            if len(items) == 1:
+                console.print(f"  ⚠  Could not save history: {e}\n", style="yellow")
+                return
+            for item in items:
+                self._save(conn, [item])
+
+    def _write_loop(self):
+        # Queue items are lists of rows (one per record_play/record_plays
+        # call); None asks the writer to stop
+        conn = None
+        while True:
+            batch = [self._writes.get()]
+            while True:
+                try:
+                    batch.append(self._writes.get_nowait())
+                except queue.Empty:
+                    break
+            items = [item for item in batch if item]
+            try:
+                if items:
+                    if conn is None:
+                        conn = self._connect()
+                    self._save(conn, items)
+            except Exception as e:
+                console.print(f"  ⚠  Could not save history: {e}\n", style="yellow")
+            finally:
+                for _ in batch:
+                    self._writes.task_done()
+            if None in batch:
+                break
+        if conn is not None:
+            conn.close()
+
+    def _enqueue(self, rows):
+        if self._writer.is_alive():
+            self._writes.put(rows)
+        else:
+            self._save(self._conn, [rows])
+
+    def flush(self):
+        """Block until every queued play has been written."""
+        if self._writer.is_alive():
+            self._writes.join()
+            return
+        # Writer is gone: write whatever it left behind ourselves
+        while True:
+            try:
+                rows = self._writes.get_nowait()
+            except queue.Empty:
+                break
+            if rows:
+                self._save(self._conn, [rows])
+            self._writes.task_done()
+
+    def close(self):
+        if self._writer.is_alive():
+            self._writes.put(None)
+            self._writer.join()
+        self._conn.close()
+
+    @staticmethod
+    def _play_row(url, title, uploader, duration, local_path=None) -> Tuple:
         h   = hashlib.md5(url.encode()).hexdigest()[:12]
         now = datetime.now().isoformat()
-        with self._conn() as c:
-            if c.execute('SELECT 1 FROM songs WHERE url_hash=?', (h,)).fetchone():
-                c.execute(
-                    'UPDATE songs SET last_played=?, play_count=play_count+1 WHERE url_hash=?',
-                    (now, h)
-                )
-            else:
-                c.execute(
-                    '''INSERT INTO songs
-                       (url, url_hash, title, uploader, duration, local_path,
-                        downloaded, played_at, last_played)
-                       VALUES (?,?,?,?,?,?,?,?,?)''',
-                    (url, h, title, uploader, duration, local_path,
-                     1 if local_path else 0, now, now)
-                )
+        return (url, h, title, uploader, duration, local_path,
+                1 if local_path else 0, now, now)
+
+    def record_play(self, url, title, uploader, duration, local_path=None):
+        self._enqueue([self._play_row(url, title, uploader, duration, local_path)])
+
+    def record_plays(self, plays):
+        """Record many (url, title, uploader, duration, local_path) plays in one transaction."""
+        rows = [self._play_row(*p) for p in plays]
+        if rows:
+            self._enqueue(rows)
 
     def search_local(self, q) -> List[Dict]:
-        with self._conn() as c:
-            rows = c.execute(
-                'SELECT * FROM songs WHERE LOWER(title) LIKE ? ORDER BY last_played DESC',
-                (f"%{q.lower()}%",)
-            ).fetchall()
+        if self._fts:
+            sql = '''SELECT s.* FROM songs_fts f JOIN songs s ON s.id = f.rowid
+                     WHERE f.title LIKE ? ORDER BY s.last_played DESC'''
+        else:
+            sql = 'SELECT * FROM songs WHERE LOWER(title) LIKE ? ORDER BY last_played DESC'
+        self.flush()
+        rows = self._conn.execute(sql, (f"%{q.lower()}%",)).fetchall()
         return [dict(r) for r in rows]
 
-    def downloaded(self) -> List[Dict]:
-        with self._conn() as c:
-            rows = c.execute(
-                'SELECT * FROM songs WHERE downloaded=1 AND local_path IS NOT NULL ORDER BY last_played DESC'
-            ).fetchall()
-        return [dict(r) for r in rows if Path(r['local_path']).exists()]
+    def downloaded(self, download_dir: Optional[Path] = None) -> List[Dict]:
+        self.flush()
+        rows = self._conn.execute(
+            'SELECT * FROM songs WHERE downloaded=1 AND local_path IS NOT NULL ORDER BY last_played DESC'
+        ).fetchall()
+        # One listing of download_dir instead of a stat() per song; files
+        # saved elsewhere (download_dir was changed) still get checked singly
+        listed, on_disk = str(download_dir) if download_dir else None, set()
+        if listed:
+            try:
+                with os.scandir(listed) as it:
+                    on_disk = {e.path for e in it}
+            except OSError:
+                listed = None
+
+        def exists(p):
+            return p in on_disk if os.path.dirname(p) == listed else os.path.exists(p)
+        return [dict(r) for r in rows if exists(r['local_path'])]
 
     def history(self, limit=20) -> List[Dict]:
-        with self._conn() as c:
-            rows = c.execute(
-                'SELECT * FROM songs ORDER BY last_played DESC LIMIT ?', (limit,)
-            ).fetchall()
+        self.flush()
+        rows = self._conn.execute(
+            'SELECT * FROM songs ORDER BY last_played DESC LIMIT ?', (limit,)
+        ).fetchall()
         return [dict(r) for r in rows]
 
     def by_url(self, url) -> Optional[Dict]:
-        with self._conn() as c:
-            r = c.execute('SELECT * FROM songs WHERE url=?', (url,)).fetchone()
+        self.flush()
+        r = self._conn.execute('SELECT * FROM songs WHERE url=?', (url,)).fetchone()
         return dict(r) if r else None
 
 
 # ─── Player ───────────────────────────────────────────────────────────────────
 
+class SilentLogger:
+    """yt-dlp logger that drops everything, like the old stderr=DEVNULL."""
+    def debug(self, msg):
+        pass
+    info = warning = error = debug
+
+
 class Player:
+    __slots__ = ("cfg", "db", "download_dir", "_ydls", "_search_cache", "_search_lock", "_next_search")
+
+    SEARCH_CACHE_SIZE = 256
+    # Min seconds between yt-dlp search calls. A safeguard only: searches run
+    # one at a time and each takes far longer, so in practice it just spaces
+    # out the --no-check-certificates retry after an instant failure.
+    SEARCH_INTERVAL   = 0.15
+    RESOLVE_TIMEOUT   = 15     # overall seconds allowed to resolve one video
+
     def __init__(self, config: Config, db: DB):
         self.cfg = config
         self.db  = db
         self.download_dir = Path(config.get("download_dir"))
         self.download_dir.mkdir(parents=True, exist_ok=True)
+        self._ydls: Dict[str, Any] = {}
+        self._search_cache: "OrderedDict[Tuple[str, int], Tuple[Dict, ...]]" = OrderedDict()
+        self._search_lock = threading.Lock()
+        self._next_search = 0.0
 
     def yt_search(self, query, limit=5) -> List[Dict]:
+        key     = (" ".join(query.lower().split()), limit)
+        entries = self._search_cache.get(key)
+        if entries is not None:
+            self._search_cache.move_to_end(key)
+        else:
+            entries = tuple(self._yt_search(query, limit))
+            if entries:
+                if len(self._search_cache) >= self.SEARCH_CACHE_SIZE:
+                    self._search_cache.popitem(last=False)
+                self._search_cache[key] = entries
+        # Copies, since callers tag results in place (merge_results)
+        return [dict(e) for e in entries]
+
+    def _throttle(self):
+        with self._search_lock:
+            wait = self._next_search - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._next_search = time.monotonic() + self.SEARCH_INTERVAL
+
+    def _yt_search(self, query, limit) -> List[Dict]:
         cmd     = ["yt-dlp", f"ytsearch{limit}:{query}", "--flat-playlist", "-J", "--no-warnings"]
         timeout = self.cfg.get("search_timeout")
         for extra in [[], ["--no-check-certificates"]]:
+            self._throttle()
             try:
                 proc = subprocess.run(
-                    cmd + extra, capture_output=True, text=True, timeout=timeout
+                    cmd + extra, stdin=subprocess.DEVNULL, capture_output=True,
+                    text=True, timeout=timeout
                 )
                 raw = proc.stdout.strip()
                 if not raw:
                     continue
-                entries = [e for e in json.loads(raw).get("entries", []) if e]
+                entries = [e for e in json_loads(raw).get("entries", []) if e]
                 if entries:
                     return entries
             except Exception:
@@ -171,33 +395,107 @@ class Player:
             return e["local_path"]
         return None
 
+    def _ydl(self):
+        """In-process YoutubeDL for the current format, or None without the yt_dlp module."""
+        fmt = self.cfg.get("audio_quality")
+        if fmt not in self._ydls:
+            try:
+                from yt_dlp import YoutubeDL
+            except ImportError:
+                self._ydls[fmt] = None
+            else:
+                self._ydls[fmt] = YoutubeDL({
+                    "quiet": True, "no_warnings": True, "skip_download": True,
+                    "noplaylist": True, "format": fmt, "extractor_retries": 0,
+                    "socket_timeout": self.RESOLVE_TIMEOUT, "logger": SilentLogger(),
+                })
+        return self._ydls[fmt]
+
+    def _extract(self, ydl, url) -> Optional[Dict]:
+        """extract_info under the same hard deadline the subprocess call has."""
+        result = {}
+
+        def run():
+            try:
+                result["info"] = ydl.extract_info(url, download=False)
+            except Exception:
+                pass
+        # socket_timeout only bounds single reads, so a stalled resolve is cut
+        # off here; the abandoned daemon thread finishes or dies on its own
+        t = threading.Thread(target=run, daemon=True)
+        t.start()
+        t.join(self.RESOLVE_TIMEOUT)
+        return result.get("info")
+
     def _stream_url(self, url) -> Optional[str]:
+        # Resolving in-process skips spawning a second Python for yt-dlp
+        ydl = self._ydl()
+        if ydl:
+            info = self._extract(ydl, url)
+            return info.get("url") if info else None
         try:
             return subprocess.check_output(
                 ["yt-dlp", "-f", self.cfg.get("audio_quality"), "-g", url],
-                stderr=subprocess.DEVNULL, text=True, timeout=15
+                stdin=subprocess.DEVNULL, stderr=subprocess.DEVNULL, text=True,
+                timeout=self.RESOLVE_TIMEOUT
             ).strip()
         except Exception:
             return None
 
-    def download(self, url, title) -> Optional[str]:
+    def _out_path(self, title) -> Path:
         safe = "".join(c for c in title if c.isalnum() or c in " -_").rstrip()
+        return self.download_dir / f"{safe}.{self.cfg.get('audio_format')}"
+
+    def video_info(self, url) -> Optional[Dict]:
+        """Metadata plus the chosen format's stream "url", from a single extraction."""
+        ydl = self._ydl()
+        if ydl:
+            return self._extract(ydl, url)
+        try:
+            proc = subprocess.run(
+                ["yt-dlp", "-J", "-f", self.cfg.get("audio_quality"),
+                 "--no-playlist", "--no-warnings", url],
+                stdin=subprocess.DEVNULL, capture_output=True, text=True,
+                timeout=self.RESOLVE_TIMEOUT
+            )
+            raw = proc.stdout.strip()
+            return json_loads(raw) if raw else None
+        except Exception:
+            return None
+
+    def download(self, url, title) -> Optional[str]:
         fmt  = self.cfg.get("audio_format")
-        out  = self.download_dir / f"{safe}.{fmt}"
+        out  = self._out_path(title)
         if out.exists():
             return str(out)
-        console.print(f"\n  ⬇  downloading: {safe}", style="dim")
+        console.print(f"\n  ⬇  downloading: {out.stem}", style="dim")
         try:
             r = subprocess.run(
                 ["yt-dlp", "-f", self.cfg.get("audio_quality"), "--extract-audio",
                  "--audio-format", fmt, "-o", str(out), url],
-                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=300
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL, timeout=300
             )
             return str(out) if r.returncode == 0 and out.exists() else None
         except Exception:
             return None
 
-    def play(self, url, title, uploader="", duration=0) -> bool:
+    def download_many(self, items) -> List[Optional[str]]:
+        """Download (url, title) pairs concurrently. Results keep input order."""
+        if not items:
+            return []
+        # yt-dlp runs are network-bound, so threads overlap them fine
+        from concurrent.futures import ThreadPoolExecutor
+        # Titles that sanitize to the same file are fetched once, so two
+        # yt-dlp runs never write one path; the rest share that result
+        unique: Dict[Path, Tuple[str, str]] = {}
+        for url, title in items:
+            unique.setdefault(self._out_path(title), (url, title))
+        with ThreadPoolExecutor(max_workers=min(8, len(unique))) as pool:
+            done = dict(zip(unique, pool.map(lambda it: self.download(*it), unique.values())))
+        return [done[self._out_path(title)] for _, title in items]
+
+    def play(self, url, title, uploader="", duration=0, stream_url=None) -> bool:
         local = self._local(url)
         if not local and self.cfg.get("auto_download"):
             local = self.download(url, title)
@@ -212,7 +510,7 @@ class Player:
             return self._mpv(local, stream=False)
 
         # Try stream URL first, fall back to passing YouTube URL directly to mpv
-        stream = self._stream_url(url)
+        stream = stream_url or self._stream_url(url)
         if stream:
             ok = self._mpv(stream, stream=True)
             if ok:
@@ -227,6 +525,7 @@ class Player:
             args.append("--no-cache")
         args.append(path)
         try:
+            # Inherits the terminal on purpose: mpv reads its own key controls
             subprocess.run(args, timeout=None)
             return True
         except FileNotFoundError:
@@ -251,11 +550,13 @@ def check_deps():
 # ─── UI helpers ───────────────────────────────────────────────────────────────
 
 def clr():
-    os.system("cls" if os.name == "nt" else "clear")
+    # Rich emits the ANSI clear sequence itself; no shell fork per screen
+    console.clear()
 
 def fmt(s):
-    s = int(s) if s else 0
-    return f"{s // 3600:02d}:{(s % 3600) // 60:02d}:{s % 60:02d}"
+    h, rem = divmod(int(s or 0), 3600)
+    m, s   = divmod(rem, 60)
+    return f"{h:02d}:{m:02d}:{s:02d}"
 
 def song_url(r) -> Optional[str]:
     if r.get("url"):
@@ -263,6 +564,9 @@ def song_url(r) -> Optional[str]:
     vid = r.get("id") or r.get("video_id")
     return f"https://www.youtube.com/watch?v={vid}" if vid else None
 
+def song_duration(r) -> int:
+    return r.get("duration_seconds") or r.get("duration", 0)
+
 def merge_results(offline, online) -> List[Dict]:
     combined, seen = [], set()
     for r in offline:
@@ -275,8 +579,13 @@ def merge_results(offline, online) -> List[Dict]:
             r["_source"] = "online";  combined.append(r); seen.add(t)
     return combined
 
+def new_table():
+    # rich.table is only needed once a screen renders, not at startup
+    from rich.table import Table
+    return Table(show_header=True, header_style="bold white", box=None, padding=(0, 2))
+
 def print_results(combined: List[Dict]):
-    t = Table(show_header=True, header_style="bold white", box=None, padding=(0, 2))
+    t = new_table()
     t.add_column("#",        style="cyan",    width=3,  no_wrap=True)
     t.add_column("Title",    style="white",   overflow="ellipsis", max_width=58)
     t.add_column("Artist",   style="dim",     max_width=22)
@@ -284,7 +593,7 @@ def print_results(combined: List[Dict]):
     t.add_column("",         style="dim",     width=2)
     for i, r in enumerate(combined, 1):
         src = "⊘" if r.get("_source") == "offline" else "◈"
-        dur = r.get("duration_seconds") or r.get("duration", 0)
+        dur = song_duration(r)
         t.add_row(str(i), r.get("title", "?"), r.get("uploader", ""), fmt(dur), src)
     console.print()
     console.print(t)
@@ -311,7 +620,7 @@ def do_search(query: str, player: Player, db: DB) -> Optional[Dict]:
 
     clr()
     print_results(combined)
-    raw = prompt("number → play   d+number → download   0 → back").lower()
+    raw = prompt("number → play   d+number → download (d1,3 for several)   0 → back").lower()
 
     if not raw or raw == "0":
         return None
@@ -320,41 +629,93 @@ def do_search(query: str, player: Player, db: DB) -> Optional[Dict]:
     num_str  = raw[1:].strip() if raw.startswith("d") else raw
 
     try:
-        idx = int(num_str) - 1
-        r   = combined[idx]
+        picks = []
+        for n in num_str.replace(",", " ").split():
+            if int(n) < 1:
+                raise IndexError   # 0 / negatives would wrap around the list
+            picks.append(combined[int(n) - 1])
+        if not picks or (action == "play" and len(picks) > 1):
+            raise ValueError
     except (ValueError, IndexError):
         console.print("  ✘  Invalid\n", style="red")
         input("  Enter...")
         return None
 
+    if action == "download":
+        download_results(picks, player, db)
+        return picks[0]
+
+    r      = picks[0]
     url    = song_url(r)
     title  = r.get("title", "?")
     artist = r.get("uploader", "")
-    dur    = r.get("duration_seconds") or r.get("duration", 0)
+    dur    = song_duration(r)
 
     if not url:
         console.print("  ✘  Could not resolve URL\n", style="red")
         input("  Enter...")
         return None
 
-    if action == "play":
-        player.play(url, title, artist, dur)
-    elif action == "download":
-        local = player.download(url, title)
+    player.play(url, title, artist, dur)
+    return r
+
+
+def download_results(picks: List[Dict], player: Player, db: DB):
+    jobs, seen = [], set()
+    for r in picks:
+        url = song_url(r)
+        if url in seen:
+            continue
+        if url:
+            seen.add(url)
+            jobs.append((url, r))
+        else:
+            console.print(f"  ✘  Could not resolve URL — {r.get('title', '?')}\n", style="red")
+
+    results = player.download_many([(url, r.get("title", "?")) for url, r in jobs])
+    saved   = []
+    for (url, r), local in zip(jobs, results):
         if local:
-            db.record_play(url, title, artist, dur, local)
-            console.print(f"  ✓  Saved to {local}\n", style="green")
+            dur = song_duration(r)
+            saved.append((url, r.get("title", "?"), r.get("uploader", ""), dur, local))
+            console.print(f"  ✓  Saved to {local}", style="green")
         else:
-            console.print("  ✘  Download failed\n", style="red")
-        input("  Enter...")
+            console.print(f"  ✘  Download failed — {r.get('title', '?')}", style="red")
+    db.record_plays(saved)
+    console.print()
+    input("  Enter...")
 
-    return r
+
+def play_url(url: str, player: Player, db: DB) -> bool:
+    """Play a pasted YouTube link directly, skipping the search round-trip."""
+    # One canonical form, the same one search results carry, so every
+    # spelling of a link maps to a single songs row
+    url  = f"https://www.youtube.com/watch?v={YT_URL_RE.match(url).group(1)}"
+    known = db.by_url(url)
+    info  = known or player.video_info(url)
+    if not info or not info.get("title"):
+        console.print("  ✘  Could not resolve URL\n", style="red")
+        return False
+    # A fresh extraction already picked the stream; don't resolve it twice
+    stream = None if known else info.get("url")
+    player.play(url, info["title"], info.get("uploader") or "", info.get("duration") or 0, stream)
+    return True
+
+
+def play_pick(raw: str, songs: List[Dict], player: Player):
+    """Play the numbered pick from a library/history listing; ignores bad input."""
+    try:
+        s = songs[int(raw) - 1]
+    except (ValueError, IndexError):
+        return
+    url = s.get("url") or s.get("local_path")
+    player.play(url, s["title"], s.get("uploader", ""), s.get("duration", 0))
 
 
 def library_screen(player: Player, db: DB):
     while True:
         clr()
-        songs = db.downloaded()
+        songs = db.downloaded(player.download_dir)
         console.print(f"\n  [bold]Library[/]  [dim]— {len(songs)} downloaded songs[/]\n")
 
         if not songs:
@@ -362,7 +723,7 @@ def library_screen(player: Player, db: DB):
             input("  Enter to go back...")
             return
 
-        t = Table(show_header=True, header_style="bold white", box=None, padding=(0, 2))
+        t = new_table()
         t.add_column("#",      style="cyan",  width=3)
         t.add_column("Title",  style="white", overflow="ellipsis", max_width=58)
         t.add_column("Artist", style="dim",   max_width=22)
@@ -374,12 +735,7 @@ def library_screen(player: Player, db: DB):
         raw = prompt("number → play   0 → back").lower()
         if not raw or raw == "0":
             return
-        try:
-            s   = songs[int(raw) - 1]
-            url = s.get("url") or s.get("local_path")
-            player.play(url, s["title"], s.get("uploader", ""), s.get("duration", 0))
-        except (ValueError, IndexError):
-            pass
+        play_pick(raw, songs, player)
 
 
 def history_screen(player: Player, db: DB):
@@ -393,17 +749,16 @@ def history_screen(player: Player, db: DB):
 
     console.print(f"\n  [bold]History[/]  [dim]— last {len(songs)} played[/]\n")
 
-    t = Table(show_header=True, header_style="bold white", box=None, padding=(0, 2))
+    t = new_table()
     t.add_column("#",      style="cyan",  width=3)
     t.add_column("Title",  style="white", overflow="ellipsis", max_width=52)
     t.add_column("Artist", style="dim",   max_width=22)
     t.add_column("Played", style="dim",   width=14)
 
     for i, s in enumerate(songs, 1):
-        try:
-            date = datetime.fromisoformat(s.get("played_at", "")).strftime("%b %d  %H:%M")
-        except Exception:
-            date = "—"
+        # played_at is always written by record_play() as isoformat()
+        ts   = s.get("played_at")
+        date = datetime.fromisoformat(ts).strftime(PLAYED_FMT) if ts else "—"
         t.add_row(str(i), s.get("title", "?"), s.get("uploader", ""), date)
 
     console.print(t)
@@ -412,11 +767,7 @@ def history_screen(player: Player, db: DB):
     raw = prompt("number → play   0 → back").lower()
     if not raw or raw == "0":
         return
-    try:
-        s   = songs[int(raw) - 1]
-        player.play(s["url"], s["title"], s.get("uploader", ""), s.get("duration", 0))
-    except (ValueError, IndexError):
-        pass
+    play_pick(raw, songs, player)
 
 
 def settings_screen(config: Config, player: Player):
@@ -468,6 +819,9 @@ def interactive(config: Config, db: DB, player: Player):
             history_screen(player, db)
         elif raw == ",":
             settings_screen(config, player)
+        elif YT_URL_RE.match(raw):
+            if not play_url(raw, player, db):
+                input("  Enter...")
         else:
             clr()
             do_search(raw, player, db)
@@ -486,6 +840,8 @@ def main():
     # Direct play: python music.py "song name"
     if args and not args[0].startswith("--"):
         query = " ".join(args)
+        if YT_URL_RE.match(query):
+            sys.exit(0 if play_url(query, player, db) else 1)
         console.print(f"\n  ⌕  {query}\n", style="dim")
         results = player.yt_search(query, limit=config.get("search_limit"))
         if not results:
@@ -497,7 +853,7 @@ def main():
         if not url:
             console.print("  ✘  Could not resolve URL\n", style="red")
             sys.exit(1)
-        player.play(url, r.get("title", ""), r.get("uploader", ""), r.get("duration", 0))
+        player.play(url, r.get("title", ""), r.get("uploader", ""), song_duration(r))
         sys.exit(0)
 
     interactive(config, db, player)